@@ -9,7 +9,7 @@ from .config import (
     reset_config,
     set_config,
 )
-from .executor import cleanup_executor
+from .executor import cleanup_executor, prewarm_executor
 from .factory import quark
 from .quark import Quark
 from .types import ErrorHandler, GetterFunction, QuarkCallback
@@ -46,6 +46,7 @@ __all__ = [
     "enable_debug",
     "disable_debug",
     "cleanup_executor",
+    "prewarm_executor",
     # Types
     "QuarkCallback",
     "ErrorHandler",
@@ -1,27 +1,51 @@
 """Batch update system for StateQuark."""
 
+import heapq
 import threading
 from collections.abc import Generator
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any
 
+from .logger import log_error
+
 if TYPE_CHECKING:
     from .quark import Quark
 
-# Batch update context
-_batch_lock = threading.Lock()
-_batch_active = threading.local()
-_batch_pending: dict[int, "Quark[Any]"] = {}
+# Batch update context. Each thread batches independently, so no lock is needed.
+_batch_state = threading.local()
 
 
 def is_batch_active() -> bool:
     """Check if batch update is active in current thread."""
-    return getattr(_batch_active, "active", False)
+    return getattr(_batch_state, "active", False)
+
+
+def is_settled(quark: "Quark[Any]") -> bool:
+    """
+    True unless ``quark`` or anything upstream still awaits this thread's flush.
+
+    A quark being flushed counts for its dependents, which it may not have
+    marked dirty yet, but not for itself.
+    """
+    state = _batch_state
+    if not getattr(state, "active", False):
+        return True
+    return _settled(quark, state.pending, state.flushing)
+
+
+def _settled(quark: "Quark[Any]", pending: dict[int, Any], flushing: int) -> bool:
+    return quark._id not in pending and all(
+        dep._id != flushing and _settled(dep, pending, flushing) for dep in quark._deps
+    )
 
 
 def add_to_batch(quark_id: int, quark: "Quark[Any]") -> None:
     """Add a quark to the pending batch updates."""
-    _batch_pending[quark_id] = quark
+    pending: dict[int, Quark[Any]] = _batch_state.pending
+    if quark_id not in pending:
+        pending[quark_id] = quark
+        # Ordered by (depth, id) so a derived quark flushes after all its deps
+        heapq.heappush(_batch_state.queue, (quark._depth, quark_id, quark))
 
 
 @contextmanager
@@ -35,29 +59,36 @@ def batch() -> Generator[None, None, None]:
             sensor2.set(60.0)
             # Callbacks fire once at end, not twice
     """
-    _batch_active.active = True
+    state = _batch_state
+    if getattr(state, "active", False):
+        # Nested batch: the outermost one flushes
+        yield
+        return
+
+    pending: dict[int, Quark[Any]] = {}
+    queue: list[tuple[int, int, Quark[Any]]] = []
+    state.pending = pending
+    state.queue = queue
+    state.flushing = 0
+    state.active = True
     try:
         yield
     finally:
         # Keep batch active during notifications to prevent cascading updates
-        # from derived quarks causing additional immediate notifications
-        with _batch_lock:
-            pending = list(_batch_pending.values())
-            _batch_pending.clear()
-
-        # Notify all pending quarks while batch is still active
-        for q in pending:
-            q._notify_sync()
-
-        # Process any derived quark updates that were queued during notifications
-        while True:
-            with _batch_lock:
-                if not _batch_pending:
-                    break
-                pending = list(_batch_pending.values())
-                _batch_pending.clear()
-            for q in pending:
-                q._notify_sync()
-
-        # Only deactivate batch after all notifications are complete
-        _batch_active.active = False
+        # from derived quarks causing additional immediate notifications.
+        # Derived quarks queued meanwhile flush once, after all their deps.
+        try:
+            while queue:
+                _, quark_id, q = heapq.heappop(queue)
+                del pending[quark_id]
+                state.flushing = quark_id
+                try:
+                    q._flush_batch()
+                except Exception as e:
+                    # One failing flush must not drop the rest of the queue
+                    log_error("Quark #%d: batch flush error: %s", quark_id, e)
+                finally:
+                    state.flushing = 0
+        finally:
+            # Only deactivate batch after all notifications are complete
+            state.active = False
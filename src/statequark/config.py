@@ -1,40 +1,42 @@
 """Configuration management for StateQuark."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from .logger import disable_debug as _disable_debug
 from .logger import enable_debug as _enable_debug
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StateQuarkConfig:
-    """Configuration for StateQuark library."""
+    """Configuration for StateQuark library. Immutable; use set_config()."""
 
     debug: bool = False
     max_workers: int = 4
+    min_workers: int = 0
     thread_name_prefix: str = "quark-callback"
     auto_cleanup: bool = True
+    # Drop queued work at shutdown instead of draining it. Faster exit, but
+    # queued storage writes and async notifications are lost, and awaiting
+    # set_async() calls get CancelledError.
+    shutdown_cancel_pending: bool = False
+    # Pin each callback worker to one CPU (Linux only; ignored elsewhere)
+    pin_workers: bool = False
 
     def __post_init__(self) -> None:
         if self.max_workers < 1:
             raise ValueError("max_workers must be at least 1")
         if self.max_workers > 32:
             raise ValueError("max_workers should not exceed 32 for embedded systems")
+        if not 0 <= self.min_workers <= self.max_workers:
+            raise ValueError("min_workers must be between 0 and max_workers")
 
-        if self.debug:
-            _enable_debug()
-        else:
-            _disable_debug()
 
-
-_config: StateQuarkConfig | None = None
+# Always set, so readers just load the current reference; writers swap it whole
+_config = StateQuarkConfig()
 
 
 def get_config() -> StateQuarkConfig:
     """Get the global configuration."""
-    global _config
-    if _config is None:
-        _config = StateQuarkConfig()
     return _config
 
 
@@ -50,19 +52,18 @@ def set_config(config: StateQuarkConfig) -> None:
 
 def enable_debug() -> None:
     """Enable debug mode."""
-    config = get_config()
-    config.debug = True
+    global _config
+    _config = replace(_config, debug=True)
     _enable_debug()
 
 
 def disable_debug() -> None:
     """Disable debug mode."""
-    config = get_config()
-    config.debug = False
+    global _config
+    _config = replace(_config, debug=False)
     _disable_debug()
 
 
 def reset_config() -> None:
     """Reset configuration to defaults."""
-    global _config
-    _config = StateQuarkConfig()
+    set_config(StateQuarkConfig())
@@ -1,5 +1,7 @@
 """Derived state computation for StateQuark."""
 
+import operator
+import threading
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, cast
 
@@ -9,6 +11,9 @@ from .logger import log_error
 if TYPE_CHECKING:
     from .quark import Quark
 
+# Shared dep reader handed to every getter; runs in C, no per-compute closure
+_get: Callable[["Quark[Any]"], Any] = operator.attrgetter("value")
+
 
 class DerivedMixin:
     """Mixin providing derived state computation capabilities."""
@@ -16,32 +21,74 @@ class DerivedMixin:
     _getter: Callable[[Callable[["Quark[Any]"], Any]], Any] | None
     _deps: list["Quark[Any]"]
     _unsubscribers: list[Callable[[], None]]
+    _equals: Callable[[Any, Any], bool] | None
+    _value: Any
+    _dirty: bool
+    _depth: int
+    _lock: threading.Lock
     _id: int
 
     def _notify_sync(self) -> None:
         """Notify subscribers synchronously. Provided by SubscriptionMixin."""
         ...
 
+    def _report_error(self, error: Exception, callback: Any) -> None:
+        """Report a callback failure. Provided by SubscriptionMixin."""
+        ...
+
     def _compute(self) -> Any:
         """Compute derived value."""
         if self._getter is None:
             raise ValueError("Cannot compute non-derived quark")
 
-        def get(dep: "Quark[Any]") -> Any:
-            return dep.value
-
         try:
-            return self._getter(get)
+            return self._getter(_get)
         except Exception as e:
             log_error("Quark #%d: compute error: %s", self._id, e)
             raise
 
+    def _refresh(self) -> Any:
+        """Recompute and cache the derived value. Holds the lock over the getter."""
+        with self._lock:
+            self._dirty = False
+            try:
+                self._value = self._compute()
+            except Exception:
+                self._dirty = True
+                raise
+            return self._value
+
     def _on_dep_change(self, dep: "Quark[Any]") -> None:
         """Handle dependency change."""
         if is_batch_active():
+            # Recompute once at flush time, not once per changed dep
+            self._dirty = True
             add_to_batch(self._id, cast("Quark[Any]", self))
-        else:
-            self._notify_sync()
+            return
+
+        old_value = self._value
+        self._dirty = True
+        if self._equals is not None and self._equals(old_value, self._refresh()):
+            return
+        self._notify_sync()
+
+    def _flush_batch(self) -> None:
+        """Notify once for a finished batch, honouring ``equals``."""
+        if self._getter is not None and self._dirty:
+            # Refresh before notifying, so subscribers reading it hit the cache
+            old_value = self._value
+            try:
+                new_value = self._refresh()
+                unchanged = self._equals is not None and self._equals(
+                    old_value, new_value
+                )
+            except Exception as e:
+                # Reported as the deferred dep reaction, like an unbatched set()
+                self._report_error(e, self._on_dep_change)
+                return
+            if unchanged:
+                return
+        self._notify_sync()
 
     def _setup_dependencies(self) -> None:
         """Subscribe to all dependencies and store unsubscribe functions."""
@@ -1,57 +1,120 @@
 """Thread pool executor management for StateQuark."""
 
-import atexit
+import itertools
+import os
 import threading
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from .config import get_config
 from .logger import log_debug, log_warning
 
 
-class ExecutorManager:
-    """Singleton manager for shared thread pool executor."""
+def _cpu_pinner() -> Callable[[], None] | None:
+    """Worker initializer that pins each new thread to the next allowed CPU."""
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    slots = itertools.count()
 
-    _instance: Optional["ExecutorManager"] = None
-    _lock: threading.Lock = threading.Lock()
+    def pin() -> None:
+        cpu = cpus[next(slots) % len(cpus)]
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            log_warning("Could not pin worker to CPU %d: %s", cpu, e)
 
-    def __new__(cls) -> "ExecutorManager":
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
+    return pin
+
+
+def _shutdown_pool(executor: ThreadPoolExecutor) -> None:
+    """Shut a pool down, logging instead of raising."""
+    try:
+        cancel = get_config().shutdown_cancel_pending
+        executor.shutdown(wait=True, cancel_futures=cancel)
+    except Exception as e:
+        log_warning("Executor shutdown error: %s", e)
+
+
+def _spawn_workers(executor: ThreadPoolExecutor, count: int) -> None:
+    """Make the pool start ``count`` worker threads, waiting at most ~2s."""
+    if count < 1 or len(executor._threads) >= count:
+        return
+
+    # Tasks hold each other at the barrier, so each lands on its own worker
+    barrier = threading.Barrier(count)
+
+    def hold() -> None:
+        try:
+            barrier.wait(timeout=1.0)
+        except threading.BrokenBarrierError:
+            pass
+
+    _, queued = wait([executor.submit(hold) for _ in range(count)], timeout=2.0)
+    if queued:
+        # Busy pool: some holds wait behind real work. Release the ones at the
+        # barrier rather than block the caller until that work finishes.
+        barrier.abort()
+        log_warning("Thread pool busy, prewarmed %d workers", len(executor._threads))
+        return
+    log_debug("Thread pool prewarmed: %d workers", count)
 
-    def __init__(self) -> None:
-        if hasattr(self, "_initialized") and self._initialized:
-            return
 
+class ExecutorManager:
+    """Manager for the shared thread pool executor."""
+
+    # __weakref__ lets weakref.finalize track the manager
+    __slots__ = (
+        "_executor",
+        "_executor_lock",
+        "_shutdown",
+        "_finalizer",
+        "__weakref__",
+    )
+
+    def __init__(self) -> None:
         self._executor: ThreadPoolExecutor | None = None
         self._executor_lock = threading.Lock()
         self._shutdown = False
-        self._initialized: bool = True
-
-        if get_config().auto_cleanup:
-            atexit.register(self.cleanup)
-
-        log_debug("ExecutorManager initialized")
+        self._finalizer: (
+            weakref.finalize[[ThreadPoolExecutor], ExecutorManager] | None
+        ) = None
 
     def get_executor(self) -> ThreadPoolExecutor:
         """Get the shared executor, creating if needed."""
         if self._shutdown:
             raise RuntimeError("ExecutorManager has been shut down")
 
-        if self._executor is None:
-            with self._executor_lock:
-                if self._executor is None:
-                    config = get_config()
-                    self._executor = ThreadPoolExecutor(
-                        max_workers=config.max_workers,
-                        thread_name_prefix=config.thread_name_prefix,
-                    )
-                    log_debug("Thread pool created: %d workers", config.max_workers)
-
-        return self._executor
+        executor = self._executor
+        if executor is not None:
+            return executor
+        with self._executor_lock:
+            executor = self._executor
+            if executor is not None:
+                return executor
+            config = get_config()
+            executor = self._executor = ThreadPoolExecutor(
+                max_workers=config.max_workers,
+                thread_name_prefix=config.thread_name_prefix,
+                initializer=_cpu_pinner() if config.pin_workers else None,
+            )
+            # Holds the pool, not the manager; detached once cleanup() runs it
+            self._finalizer = weakref.finalize(self, _shutdown_pool, executor)
+            self._finalizer.atexit = config.auto_cleanup
+            log_debug("Thread pool created: %d workers", config.max_workers)
+
+        # Keep a warm set so bursts don't pay for thread creation
+        _spawn_workers(executor, config.min_workers)
+        return executor
+
+    def prewarm(self, workers: int | None = None) -> None:
+        """Start worker threads now instead of on the first callbacks."""
+        executor = self.get_executor()
+        max_workers = get_config().max_workers
+        _spawn_workers(
+            executor, max_workers if workers is None else min(workers, max_workers)
+        )
 
     def cleanup(self) -> None:
         """Shutdown the executor gracefully."""
@@ -59,15 +122,17 @@ class ExecutorManager:
             return
 
         with self._executor_lock:
-            if self._executor is not None and not self._shutdown:
-                log_debug("Shutting down executor")
-                try:
-                    self._executor.shutdown(wait=True, cancel_futures=False)
-                except Exception as e:
-                    log_warning("Executor shutdown error: %s", e)
-                finally:
-                    self._executor = None
-                    self._shutdown = True
+            if self._executor is None or self._shutdown:
+                return
+            finalizer = self._finalizer
+            self._executor = None
+            self._finalizer = None
+            self._shutdown = True
+
+        # Wait for the pool outside the lock so other callers aren't held up
+        log_debug("Shutting down executor")
+        if finalizer is not None:
+            finalizer()
 
     def reset(self) -> None:
         """Reset for testing purposes."""
@@ -76,17 +141,12 @@ class ExecutorManager:
             self._shutdown = False
 
 
-_executor_manager: ExecutorManager | None = None
-_manager_lock = threading.Lock()
+# Built at import, so the import lock serialises creation and reads need no lock
+_executor_manager = ExecutorManager()
 
 
 def get_executor_manager() -> ExecutorManager:
     """Get the global executor manager."""
-    global _executor_manager
-    if _executor_manager is None:
-        with _manager_lock:
-            if _executor_manager is None:
-                _executor_manager = ExecutorManager()
     return _executor_manager
 
 
@@ -95,6 +155,11 @@ def get_shared_executor() -> ThreadPoolExecutor:
     return get_executor_manager().get_executor()
 
 
+def prewarm_executor(workers: int | None = None) -> None:
+    """Start shared worker threads ahead of time (defaults to max_workers)."""
+    get_executor_manager().prewarm(workers)
+
+
 def cleanup_executor() -> None:
     """Cleanup the shared executor."""
     get_executor_manager().cleanup()
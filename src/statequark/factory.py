@@ -20,8 +20,9 @@ class _TypedQuarkFactory(Generic[T]):
         initial_or_getter: T | Callable[[Callable[[Quark[Any]], Any]], T],
         deps: list[Quark[Any]] | None = None,
         error_handler: Optional["ErrorHandler"] = None,
+        equals: Callable[[T, T], bool] | None = None,
     ) -> Quark[T]:
-        return Quark(initial_or_getter, deps, error_handler)
+        return Quark(initial_or_getter, deps, error_handler, equals)
 
 
 class QuarkFactory:
@@ -45,6 +46,7 @@ class QuarkFactory:
         initial_or_getter: T,
         deps: None = None,
         error_handler: Optional["ErrorHandler"] = None,
+        equals: Callable[[T, T], bool] | None = None,
     ) -> Quark[T]: ...
 
     @overload
@@ -53,6 +55,7 @@ class QuarkFactory:
         initial_or_getter: Callable[[Callable[[Quark[Any]], Any]], T],
         deps: list[Quark[Any]],
         error_handler: Optional["ErrorHandler"] = None,
+        equals: Callable[[T, T], bool] | None = None,
     ) -> Quark[T]: ...
 
     def __call__(
@@ -60,9 +63,10 @@ class QuarkFactory:
         initial_or_getter: T | Callable[[Callable[[Quark[Any]], Any]], T],
         deps: list[Quark[Any]] | None = None,
         error_handler: Optional["ErrorHandler"] = None,
+        equals: Callable[[T, T], bool] | None = None,
     ) -> Quark[T]:
         """Create a new Quark instance."""
-        return Quark(initial_or_getter, deps, error_handler)
+        return Quark(initial_or_getter, deps, error_handler, equals)
 
     def __getitem__(self, type_hint: type[T]) -> _TypedQuarkFactory[T]:
         """Enable quark[Type](value) syntax for explicit type hints."""
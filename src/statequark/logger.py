@@ -2,69 +2,93 @@
 
 import logging
 import sys
+from collections.abc import Callable
 
-_logger: logging.Logger | None = None
-_debug_enabled: bool = False
 
+def _discard(message: str, *args: object) -> None:
+    """Debug sink used while debug logging is off."""
 
-def get_logger() -> logging.Logger:
-    """Get or create the StateQuark logger instance."""
-    global _logger
-    if _logger is None:
-        _logger = logging.getLogger("statequark")
-        _logger.setLevel(logging.WARNING)
-        _logger.propagate = False
-
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(logging.DEBUG)
-        handler.setFormatter(
-            logging.Formatter(
-                "[%(asctime)s] %(levelname)s [%(name)s:%(lineno)d] %(message)s",
-                datefmt="%H:%M:%S",
-            )
+
+class _DebugFlag:
+    """Mutable debug switch that hot paths can check without a call."""
+
+    __slots__ = ("enabled", "log")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        # Bound Logger.debug while enabled, a no-op otherwise
+        self.log: Callable[..., None] = _discard
+
+
+debug_flag = _DebugFlag()
+
+
+def _create_logger() -> logging.Logger:
+    """Configure the StateQuark logger."""
+    logger = logging.getLogger("statequark")
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(
+        logging.Formatter(
+            "[%(asctime)s] %(levelname)s [%(name)s:%(lineno)d] %(message)s",
+            datefmt="%H:%M:%S",
         )
+    )
+
+    if not logger.handlers:
+        logger.addHandler(handler)
+
+    return logger
 
-        if not _logger.handlers:
-            _logger.addHandler(handler)
 
+# Cheap to build, so create it eagerly and skip a None check on every log call
+_logger = _create_logger()
+
+
+def get_logger() -> logging.Logger:
+    """Get the StateQuark logger instance."""
     return _logger
 
 
 def enable_debug() -> None:
     """Enable debug logging."""
-    global _debug_enabled
-    _debug_enabled = True
-    get_logger().setLevel(logging.DEBUG)
+    _logger.setLevel(logging.DEBUG)
+    debug_flag.log = _logger.debug
+    debug_flag.enabled = True
 
 
 def disable_debug() -> None:
     """Disable debug logging."""
-    global _debug_enabled
-    _debug_enabled = False
-    get_logger().setLevel(logging.WARNING)
+    debug_flag.enabled = False
+    debug_flag.log = _discard
+    _logger.setLevel(logging.WARNING)
 
 
 def is_debug_enabled() -> bool:
     """Check if debug logging is enabled."""
-    return _debug_enabled
+    return debug_flag.enabled
 
 
 def log_debug(message: str, *args: object) -> None:
     """Log debug message (only if debug enabled)."""
-    if _debug_enabled:
-        get_logger().debug(message, *args)
+    flag = debug_flag
+    if flag.enabled:
+        flag.log(message, *args)
 
 
 def log_info(message: str, *args: object) -> None:
     """Log info message."""
-    get_logger().info(message, *args)
+    _logger.info(message, *args)
 
 
 def log_warning(message: str, *args: object) -> None:
     """Log warning message."""
-    get_logger().warning(message, *args)
+    _logger.warning(message, *args)
 
 
 def log_error(message: str, *args: object) -> None:
     """Log error message."""
-    get_logger().error(message, *args)
+    _logger.error(message, *args)
@@ -1,12 +1,13 @@
 """Core Quark atom implementation for atomic state management."""
 
+import itertools
 import threading
-from collections.abc import Callable
-from typing import TYPE_CHECKING, Any, Generic, Optional, cast
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, Optional, cast
 
-from .batch import add_to_batch, is_batch_active
+from .batch import add_to_batch, is_batch_active, is_settled
 from .derived import DerivedMixin
-from .logger import log_debug
+from .logger import debug_flag, log_debug
 from .store import SubscriptionMixin
 from .types import T
 
@@ -30,28 +31,46 @@ class Quark(SubscriptionMixin, DerivedMixin, Generic[T]):
         "_deps",
         "_unsubscribers",
         "_error_handler",
+        "_equals",
+        "_dirty",
+        "_depth",
+        "_update_lock",
         "_id",
     )
 
-    _instance_counter: int = 0
-    _counter_lock: threading.Lock = threading.Lock()
+    # next() on itertools.count is atomic under the GIL
+    _id_counter: ClassVar[Iterator[int]] = itertools.count(1)
+    _update_lock_guard: ClassVar[threading.Lock] = threading.Lock()
 
     def __init__(
         self,
         initial_or_getter: T | Callable[[Callable[["Quark[Any]"], Any]], T],
         deps: list["Quark[Any]"] | None = None,
         error_handler: Optional["ErrorHandler"] = None,
+        equals: Callable[[T, T], bool] | None = None,
     ) -> None:
-        """Create a Quark. Raises ValueError if getter has no deps."""
-        with Quark._counter_lock:
-            Quark._instance_counter += 1
-            self._id = Quark._instance_counter
-
-        self._lock = threading.RLock()
-        self._callbacks: list[QuarkCallback] = []
+        """
+        Create a Quark. Raises ValueError if getter has no deps.
+
+        ``equals`` compares the previous and new (or recomputed) value;
+        subscribers are skipped when it returns True.
+        """
+        self._id = next(Quark._id_counter)
+
+        # Non-reentrant. Callbacks run after it is released, so they may call
+        # back into this quark freely. A derived getter runs while its own
+        # quark's lock is held, so it must only read deps: calling set(),
+        # subscribe() or cleanup() on its own quark from the getter deadlocks.
+        self._lock = threading.Lock()
+        # Copy-on-write so notify can read a snapshot without locking
+        self._callbacks: tuple[QuarkCallback, ...] = ()
         self._deps: list[Quark[Any]] = deps or []
         self._unsubscribers: list[Callable[[], None]] = []
         self._error_handler = error_handler
+        self._equals = equals
+        self._dirty = False
+        # Created on first update() so plain quarks don't pay for a second lock
+        self._update_lock: threading.RLock | None = None
 
         if callable(initial_or_getter):
             if not self._deps:
@@ -60,6 +79,7 @@ class Quark(SubscriptionMixin, DerivedMixin, Generic[T]):
                 initial_or_getter
             )
             self._initial: T | None = None
+            self._depth = 1 + max(dep._depth for dep in self._deps)
             self._value: T = self._compute()
 
             log_debug(
@@ -70,16 +90,21 @@ class Quark(SubscriptionMixin, DerivedMixin, Generic[T]):
         else:
             self._getter = None
             self._initial = initial_or_getter
+            self._depth = 0
             self._value = initial_or_getter
 
             log_debug("Created Quark #%d: %r", self._id, initial_or_getter)
 
     @property
     def value(self) -> T:
-        """Current value. Recomputes for derived quarks."""
+        """Current value. Derived quarks recompute only after a dep changes."""
         if self._getter:
-            with self._lock:
+            if not is_settled(self):
+                # Queued here or upstream: the change has not propagated yet,
+                # and the cache must keep the old value for the flush
                 return cast(T, self._compute())
+            if self._dirty:
+                return cast(T, self._refresh())
         return self._value
 
     def set(self, new_value: T) -> None:
@@ -88,24 +113,62 @@ class Quark(SubscriptionMixin, DerivedMixin, Generic[T]):
             if self._getter:
                 raise ValueError("Cannot set derived quark directly")
             old_value = self._value
+            if self._equals is not None and self._equals(old_value, new_value):
+                return
             self._value = new_value
-            log_debug("Quark #%d: %r -> %r", self._id, old_value, new_value)
+            if debug_flag.enabled:
+                log_debug("Quark #%d: %r -> %r", self._id, old_value, new_value)
 
         if is_batch_active():
             add_to_batch(self._id, self)
         else:
             self._notify_sync()
 
+    def update(self, fn: Callable[[T], T]) -> None:
+        """
+        Atomically set the value to ``fn(current)``. Raises ValueError on derived.
+
+        Goes through ``set()``, so subclass hooks still apply. Concurrent
+        update() calls on one quark are serialised; plain set() is not blocked.
+        """
+        lock = self._update_lock
+        if lock is None:
+            with Quark._update_lock_guard:
+                lock = self._update_lock
+                if lock is None:
+                    lock = self._update_lock = threading.RLock()
+        with lock:
+            self.set(fn(self.value))
+
     async def set_async(self, new_value: T) -> None:
-        """Set value asynchronously. Raises ValueError on derived quark."""
+        """
+        Set value asynchronously. Raises ValueError on derived quark.
+
+        Inside ``batch()`` notification is deferred to the batch flush, as with set().
+        """
         with self._lock:
             if self._getter:
                 raise ValueError("Cannot set derived quark directly")
             old_value = self._value
+            if self._equals is not None and self._equals(old_value, new_value):
+                return
             self._value = new_value
-            log_debug("Quark #%d (async): %r -> %r", self._id, old_value, new_value)
+            if debug_flag.enabled:
+                log_debug("Quark #%d (async): %r -> %r", self._id, old_value, new_value)
+
+        if is_batch_active():
+            add_to_batch(self._id, self)
+        else:
+            await self._notify()
+
+    async def update_async(self, fn: Callable[[T], T]) -> None:
+        """
+        Set the value to ``fn(current)`` and notify asynchronously.
 
-        await self._notify()
+        Atomic against other coroutines, as nothing awaits between the read
+        and the write; use update() when writers are threads.
+        """
+        await self.set_async(fn(self.value))
 
     def reset(self) -> None:
         """Reset to initial value. Raises ValueError on derived quark."""
@@ -120,7 +183,7 @@ class Quark(SubscriptionMixin, DerivedMixin, Generic[T]):
             log_debug("Quark #%d: cleanup", self._id)
             self._cleanup_dependencies()
             self._deps.clear()
-            self._callbacks.clear()
+            self._callbacks = ()
 
     def __repr__(self) -> str:
         return f"Quark(value={self.value!r})"
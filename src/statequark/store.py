@@ -1,39 +1,87 @@
 """Subscription and notification system for StateQuark."""
 
 import asyncio
+import inspect
 import threading
+import weakref
+from collections import deque
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, cast
 
 from .executor import get_shared_executor
-from .logger import log_debug, log_error
+from .logger import debug_flag, log_debug, log_error
 
 if TYPE_CHECKING:
     from .quark import Quark
     from .types import ErrorHandler, QuarkCallback
 
 
+class _WeakCallback:
+    """
+    Weakly held callback; dead entries drop on next call.
+
+    Equal to other entries wrapping the same callable, so subscribe() dedupes.
+    """
+
+    __slots__ = ("_ref", "_drop")
+
+    def __init__(self, callback: "QuarkCallback", drop: Callable[[], None]) -> None:
+        self._ref: Callable[[], QuarkCallback | None] = (
+            weakref.WeakMethod(callback)
+            if inspect.ismethod(callback)
+            else weakref.ref(callback)
+        )
+        self._drop = drop
+
+    def __call__(self, quark: "Quark[Any]") -> None:
+        cb = self._ref()
+        if cb is None:
+            self._drop()
+        else:
+            cb(quark)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _WeakCallback):
+            return NotImplemented
+        # Refs to the same live callable compare equal; dead ones by identity
+        return self._ref == other._ref
+
+    def __hash__(self) -> int:
+        return hash(self._ref)
+
+
 class SubscriptionMixin:
     """Mixin providing subscription and notification capabilities."""
 
-    _callbacks: list["QuarkCallback"]
+    _callbacks: tuple["QuarkCallback", ...]
     _error_handler: "ErrorHandler | None"
     _id: int
-    _lock: threading.RLock
+    _lock: threading.Lock
+
+    def subscribe(
+        self, callback: "QuarkCallback", weak: bool = False
+    ) -> Callable[[], None]:
+        """
+        Subscribe to value changes. Returns unsubscribe function.
+
+        With ``weak=True`` only a weak reference to ``callback`` is kept, so
+        its owner can be garbage collected without unsubscribing.
+        """
+        entry: QuarkCallback = (
+            _WeakCallback(callback, lambda: unsubscribe()) if weak else callback
+        )
 
-    def subscribe(self, callback: "QuarkCallback") -> Callable[[], None]:
-        """Subscribe to value changes. Returns unsubscribe function."""
         with self._lock:
-            if callback not in self._callbacks:
-                self._callbacks.append(callback)
+            if entry not in self._callbacks:
+                self._callbacks = (*self._callbacks, entry)
                 log_debug(
                     "Quark #%d: +subscriber (%d total)", self._id, len(self._callbacks)
                 )
 
         def unsubscribe() -> None:
             with self._lock:
-                if callback in self._callbacks:
-                    self._callbacks.remove(callback)
+                if entry in self._callbacks:
+                    self._callbacks = tuple(cb for cb in self._callbacks if cb != entry)
                     log_debug(
                         "Quark #%d: -subscriber (%d remaining)",
                         self._id,
@@ -44,42 +92,61 @@ class SubscriptionMixin:
 
     async def _notify(self) -> None:
         """Notify subscribers asynchronously."""
-        with self._lock:
-            callbacks = self._callbacks[:]
+        callbacks = self._callbacks
 
         if not callbacks:
             return
 
-        log_debug("Quark #%d: notify %d (async)", self._id, len(callbacks))
-        executor = get_shared_executor()
+        if debug_flag.enabled:
+            log_debug("Quark #%d: notify %d (async)", self._id, len(callbacks))
         loop = asyncio.get_running_loop()
+        executor = get_shared_executor()
+        if len(callbacks) == 1:
+            # No gather() bookkeeping for the common single subscriber
+            await loop.run_in_executor(executor, self._safe_call, callbacks[0])
+            return
+        # Submitted in order but run across the pool, so one slow subscriber
+        # (a GPIO write, a blocking POST) doesn't hold up the others
         await asyncio.gather(
             *[loop.run_in_executor(executor, self._safe_call, cb) for cb in callbacks]
         )
 
     def _notify_sync(self) -> None:
         """Notify subscribers synchronously."""
-        with self._lock:
-            callbacks = self._callbacks[:]
+        callbacks = self._callbacks
 
         if not callbacks:
             return
 
-        log_debug("Quark #%d: notify %d (sync)", self._id, len(callbacks))
-        for cb in callbacks:
-            self._safe_call(cb)
+        if debug_flag.enabled:
+            log_debug("Quark #%d: notify %d (sync)", self._id, len(callbacks))
+        self._call_each(callbacks)
+
+    def _call_each(self, callbacks: tuple["QuarkCallback", ...]) -> None:
+        """Run callbacks in subscription order with error handling."""
+        safe_call = self._safe_call
+        if len(callbacks) > 4:
+            # Drive wide fan-out from C; a plain loop is cheaper for a few
+            deque(map(safe_call, callbacks), maxlen=0)
+        else:
+            for cb in callbacks:
+                safe_call(cb)
 
     def _safe_call(self, callback: "QuarkCallback") -> None:
         """Execute callback with error handling."""
         try:
             callback(cast("Quark[Any]", self))
         except Exception as e:
-            log_error("Quark #%d: callback error: %s", self._id, e)
-            if self._error_handler:
-                try:
-                    self._error_handler(e, callback, cast("Quark[Any]", self))
-                except Exception as he:
-                    log_error("Quark #%d: error handler failed: %s", self._id, he)
+            self._report_error(e, callback)
+
+    def _report_error(self, error: Exception, callback: "QuarkCallback") -> None:
+        """Log a callback failure and pass it to the error handler, if any."""
+        log_error("Quark #%d: callback error: %s", self._id, error)
+        if self._error_handler:
+            try:
+                self._error_handler(error, callback, cast("Quark[Any]", self))
+            except Exception as he:
+                log_error("Quark #%d: error handler failed: %s", self._id, he)
 
     def set_error_handler(self, handler: "ErrorHandler | None") -> None:
         """Set custom error handler for callback exceptions."""
@@ -10,12 +10,11 @@ from ..types import T
 class HistoryQuark(Quark[T], Generic[T]):
     """Quark that maintains history of previous values."""
 
-    __slots__ = ("_history", "_max_size", "_position")
+    __slots__ = ("_history", "_position")
 
     def __init__(self, initial: T, max_size: int = 10) -> None:
         super().__init__(initial)
         self._history: deque[T] = deque([initial], maxlen=max_size + 1)
-        self._max_size = max_size
         self._position = 0
 
     def set(self, new_value: T) -> None:
@@ -30,10 +30,9 @@ Loadable: TypeAlias = LoadableLoading | LoadableHasData[T] | LoadableHasError
 class LoadableQuark(Quark[Loadable[T]], Generic[T]):
     """Quark that wraps async values with loading/error states."""
 
-    __slots__ = ("_source", "_unsub")
+    __slots__ = ("_unsub",)
 
     def __init__(self, source: Quark[T]) -> None:
-        self._source = source
         super().__init__(LoadableHasData(data=source.value))
         self._unsub = source.subscribe(self._on_source_change)
 
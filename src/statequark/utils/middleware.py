@@ -1,43 +1,50 @@
 """Middleware system for Quark state changes."""
 
+import copy
 from collections.abc import Callable
 from typing import Any, Generic
 
 from ..quark import Quark
 from ..types import T
 
+_MISSING = object()
+
 Middleware = Callable[[T, T, Callable[[T], None]], None]
 
 
 class MiddlewareQuark(Quark[T], Generic[T]):
     """Quark with middleware pipeline for state changes."""
 
-    __slots__ = ("_middlewares",)
+    __slots__ = ("_middlewares", "_chain")
 
     def __init__(self, initial: T) -> None:
         super().__init__(initial)
         self._middlewares: list[Middleware[T]] = []
+        self._chain: Callable[[T], None] = super().set
 
     def use(self, middleware: Middleware[T]) -> "MiddlewareQuark[T]":
         """Add middleware. Returns self for chaining."""
         self._middlewares.append(middleware)
+        self._chain = self._compile()
         return self
 
-    def set(self, new_value: T) -> None:
-        if not self._middlewares:
-            super().set(new_value)
-            return
+    def _compile(self) -> Callable[[T], None]:
+        """Fold the pipeline into nested ``next`` functions, built once per use()."""
+        chain: Callable[[T], None] = super().set
+        for mw in reversed(self._middlewares):
+            chain = self._link(mw, chain)
+        return chain
 
-        def create_next(index: int) -> Callable[[T], None]:
-            def next_fn(value: T) -> None:
-                if index >= len(self._middlewares):
-                    super(MiddlewareQuark, self).set(value)
-                else:
-                    self._middlewares[index](self._value, value, create_next(index + 1))
+    def _link(
+        self, mw: Middleware[T], next_fn: Callable[[T], None]
+    ) -> Callable[[T], None]:
+        def run(value: T) -> None:
+            mw(self._value, value, next_fn)
 
-            return next_fn
+        return run
 
-        create_next(0)(new_value)
+    def set(self, new_value: T) -> None:
+        self._chain(new_value)
 
 
 def middleware(initial: T) -> MiddlewareQuark[T]:
@@ -56,10 +63,23 @@ def logger(name: str = "quark") -> Middleware[Any]:
 
 
 def persist(storage: dict[str, Any], key: str) -> Middleware[Any]:
-    """Middleware that persists state to a dict."""
+    """
+    Middleware that persists state to a dict.
+
+    Writes are skipped when the value equals the last one this middleware
+    wrote, so it assumes it is the only writer of ``storage[key]``.
+    """
+
+    last: Any = _MISSING
 
     def persist_middleware(old: Any, new: Any, next_fn: Callable[[Any], None]) -> None:
+        nonlocal last
         next_fn(new)
-        storage[key] = new
+        # Real key-value backends pay per write; skip ones that change nothing.
+        # Compared with the last value written, so no backend read is needed.
+        if last is _MISSING or last != new:
+            storage[key] = new
+            # A copy, so a value mutated in place and set again still differs
+            last = copy.deepcopy(new)
 
     return persist_middleware
@@ -12,7 +12,7 @@ S = TypeVar("S")
 class SelectQuark(Quark[S], Generic[S]):
     """Quark that selects a slice of another Quark's value."""
 
-    __slots__ = ("_source", "_selector", "_equals", "_unsub")
+    __slots__ = ("_source", "_selector", "_unsub")
 
     def __init__(
         self,
@@ -22,15 +22,14 @@ class SelectQuark(Quark[S], Generic[S]):
     ) -> None:
         self._source = source
         self._selector = selector
-        self._equals = equals or (lambda a, b: a == b)
 
         initial = selector(source.value)
-        super().__init__(initial)
+        super().__init__(initial, equals=equals or (lambda a, b: a == b))
         self._unsub = source.subscribe(self._on_source_change)
 
     def _on_source_change(self, src: Quark[Any]) -> None:
         new_slice = self._selector(src.value)
-        if not self._equals(self._value, new_slice):
+        if self._equals is None or not self._equals(self._value, new_slice):
             self._value = new_slice
             self._notify_sync()
 
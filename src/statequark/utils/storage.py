@@ -1,13 +1,55 @@
 """Persistent storage for Quark state."""
 
+import asyncio
+import atexit
+import contextlib
+import copy
 import json
+import os
+import threading
+import weakref
 from pathlib import Path
 from typing import Any, Generic, Protocol, cast
 
+from ..batch import is_batch_active
+from ..executor import get_shared_executor
 from ..logger import log_warning
 from ..quark import Quark
 from ..types import T
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_ORJSON = False
+
+
+def _dumps(value: Any) -> bytes:
+    if _HAS_ORJSON:
+        # Annotated rather than cast: orjson is typed only when installed
+        data: bytes = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        return data
+    return json.dumps(value).encode()
+
+
+def _loads(data: bytes) -> Any:
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _file_stamp(st: os.stat_result) -> tuple[int, int, int]:
+    # Changes whenever a file is replaced, rewritten or removed and recreated
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# Path separators that keys must not smuggle into the storage directory
+_SEPARATORS = str.maketrans({"/": "_", "\\": "_"})
+
+
+_MISSING = object()
+
 
 class Storage(Protocol[T]):
     """Storage backend protocol."""
@@ -17,46 +59,152 @@ class Storage(Protocol[T]):
 
 
 class FileStorage(Generic[T]):
-    """JSON file-based storage for IoT devices."""
+    """
+    JSON file-based storage for IoT devices.
+
+    With ``flush_interval`` (seconds), writes are buffered and only the latest
+    value per key is written once per interval. Call ``flush()`` to write now;
+    pending values are also flushed at exit.
+    """
+
+    __slots__ = (
+        "_dir",
+        "_sanitize_keys",
+        "_paths",
+        "_written",
+        "_flush_interval",
+        "_pending",
+        "_pending_lock",
+        "_timer",
+        "__weakref__",
+    )
 
     def __init__(
         self,
         directory: str | Path = ".statequark",
         sanitize_keys: bool = True,
+        flush_interval: float | None = None,
     ) -> None:
         self._dir = Path(directory)
         self._dir.mkdir(parents=True, exist_ok=True)
         self._sanitize_keys = sanitize_keys
+        # Keys are few and reused on every write; resolve() is a syscall
+        self._paths: dict[str, str] = {}
+        # Last bytes written per key, with the file stamp they produced
+        self._written: dict[str, tuple[bytes, tuple[int, int, int]]] = {}
+        self._flush_interval = flush_interval
+        self._pending: dict[str, Any] = {}
+        self._pending_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        if flush_interval is not None:
+            _write_behind.add(self)
 
-    def _path(self, key: str) -> Path:
+    def _path(self, key: str) -> str:
+        # Plain str so hot reads/writes build no Path objects
+        path = self._paths.get(key)
+        if path is not None:
+            return path
+        name = key
         if self._sanitize_keys:
-            key = key.replace("/", "_").replace("\\", "_").replace("..", "_")
-        path = (self._dir / f"{key}.json").resolve()
-        if not path.is_relative_to(self._dir.resolve()):
-            raise ValueError(f"Invalid storage key: {key}")
+            name = name.translate(_SEPARATORS).replace("..", "_")
+        resolved = (self._dir / f"{name}.json").resolve()
+        if not resolved.is_relative_to(self._dir.resolve()):
+            raise ValueError(f"Invalid storage key: {name}")
+        path = self._paths[key] = str(resolved)
         return path
 
     def get(self, key: str, default: T) -> T:
+        value = self._pending.get(key, _MISSING)
+        if value is not _MISSING:
+            return cast(T, value)
         path = self._path(key)
-        if not path.exists():
-            return default
+        # One open() instead of exists() + open(), and no TOCTOU window
         try:
-            with open(path) as f:
-                return cast(T, json.load(f))
-        except (json.JSONDecodeError, OSError):
+            with open(path, "rb") as f:
+                return cast(T, _loads(f.read()))
+        except (ValueError, OSError):
             return default
 
     def set(self, key: str, value: T) -> None:
+        if self._flush_interval is None:
+            self._write(key, value)
+            return
+        with self._pending_lock:
+            self._pending[key] = value
+            if self._timer is None:
+                self._timer = threading.Timer(self._flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write buffered values now."""
+        with self._pending_lock:
+            pending = dict(self._pending)
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+        for key, value in pending.items():
+            try:
+                self._write(key, value)
+            except Exception as e:
+                # Often runs on the timer thread, where raising would lose the
+                # rest of the batch; an unwritable value is dropped instead
+                log_warning("Failed to write storage key '%s': %s", key, e)
+
+        # Keep entries that were replaced meanwhile for the next flush
+        with self._pending_lock:
+            for key, value in pending.items():
+                if self._pending.get(key, _MISSING) is value:
+                    del self._pending[key]
+
+    def _write(self, key: str, value: T) -> None:
+        data = _dumps(value)
+        path = self._path(key)
+        # Polling sensors often re-store identical readings; skip the disk.
+        # A stat, not a read, tells whether another writer touched the file.
+        written = self._written.get(key)
+        if written is not None and written[0] == data:
+            try:
+                if _file_stamp(os.stat(path)) == written[1]:
+                    return
+            except OSError:
+                pass
+        # Write aside, fsync, then rename: a power cut leaves the old or the
+        # new file, never a torn one. Unique per process and thread.
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            with open(self._path(key), "w") as f:
-                json.dump(value, f)
-        except OSError as e:
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                stamp = _file_stamp(os.fstat(f.fileno()))
+            os.replace(tmp, path)
+            self._written[key] = (data, stamp)
+        except BaseException as e:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            if not isinstance(e, OSError):
+                raise
             log_warning("Failed to write storage key '%s': %s", key, e)
 
 
+# Write-behind storages still holding data. Held weakly: one with pending
+# values is kept alive by its timer, so nothing buffered is dropped.
+_write_behind: "weakref.WeakSet[FileStorage[Any]]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_write_behind() -> None:
+    for storage in list(_write_behind):
+        storage.flush()
+
+
 class MemoryStorage(Generic[T]):
     """In-memory storage (for testing or volatile state)."""
 
+    __slots__ = ("_data",)
+
     def __init__(self) -> None:
         self._data: dict[str, Any] = {}
 
@@ -66,6 +214,10 @@ class MemoryStorage(Generic[T]):
     def set(self, key: str, value: T) -> None:
         self._data[key] = value
 
+    def clear(self) -> None:
+        """Remove all stored values."""
+        self._data.clear()
+
 
 _default_storage: FileStorage[Any] | None = None
 
@@ -80,7 +232,7 @@ def get_default_storage() -> FileStorage[Any]:
 class StorageQuark(Quark[T]):
     """Quark that persists its value to storage."""
 
-    __slots__ = ("_storage", "_key")
+    __slots__ = ("_storage", "_key", "_persist_lock", "_persisted")
 
     def __init__(
         self,
@@ -90,16 +242,36 @@ class StorageQuark(Quark[T]):
     ) -> None:
         self._storage: Storage[T] = storage or get_default_storage()
         self._key = key
+        self._persist_lock = threading.Lock()
+        # Snapshot of the last value written, so unchanged sets skip encoding
+        self._persisted: Any = _MISSING
         initial = self._storage.get(key, default)
         super().__init__(initial)
 
-    def set(self, new_value: T) -> None:
-        super().set(new_value)
-        self._storage.set(self._key, new_value)
+    def _persist(self) -> None:
+        # Writes run one at a time and store the value current at write time,
+        # so overlapping set_async() calls can't land out of order
+        with self._persist_lock:
+            value = self._value
+            if self._persisted is not _MISSING and self._persisted == value:
+                return
+            self._storage.set(self._key, value)
+            # A copy, so later in-place mutation of value still counts as a change
+            self._persisted = copy.deepcopy(value)
+
+    def _notify_sync(self) -> None:
+        # Persist once per notification pass so batch() coalesces writes
+        self._persist()
+        super()._notify_sync()
 
     async def set_async(self, new_value: T) -> None:
         await super().set_async(new_value)
-        self._storage.set(self._key, new_value)
+        if is_batch_active():
+            # Written once by _notify_sync when the batch flushes
+            return
+        # Keep blocking disk I/O off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(get_shared_executor(), self._persist)
 
 
 def quark_with_storage(
@@ -0,0 +1,57 @@
+"""Shared fixtures."""
+
+import threading
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import pytest
+
+from statequark.utils import timing
+
+
+class _FakeTimer:
+    def __init__(self, due: float, fn: Callable[[], None]) -> None:
+        self.due = due
+        self.fn = fn
+        self.cancelled = False
+
+    def start(self) -> None:
+        pass
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class FakeClock:
+    """Virtual time for timing utilities; ``advance()`` fires due timers."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._timers: list[_FakeTimer] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def Timer(self, interval: float, fn: Callable[[], None]) -> _FakeTimer:
+        timer = _FakeTimer(self.now + interval, fn)
+        self._timers.append(timer)
+        return timer
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        due = [t for t in self._timers if t.due <= self.now]
+        self._timers = [t for t in self._timers if t.due > self.now]
+        for timer in sorted(due, key=lambda t: t.due):
+            if not timer.cancelled:
+                timer.fn()
+
+
+@pytest.fixture
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Drive debounce/throttle from virtual time instead of real sleeps."""
+    clock = FakeClock()
+    monkeypatch.setattr(timing, "time", clock)
+    monkeypatch.setattr(
+        timing, "threading", SimpleNamespace(Timer=clock.Timer, Lock=threading.Lock)
+    )
+    return clock
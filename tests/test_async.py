@@ -1,20 +1,23 @@
 """Async functionality tests."""
 
 import asyncio
+import threading
 
 import pytest
 
-from statequark import quark
+from statequark import StateQuarkConfig, batch, quark, reset_config, set_config
+from statequark.executor import get_executor_manager
+
+# One event loop for the whole module instead of one per test
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
 
-@pytest.mark.asyncio
 async def test_async_set():
     temp = quark(20.0)
     await temp.set_async(25.5)
     assert temp.value == 25.5
 
 
-@pytest.mark.asyncio
 async def test_async_with_subscriptions():
     values = []
     sensor = quark(10)
@@ -26,7 +29,6 @@ async def test_async_with_subscriptions():
     assert values == [20, 30]
 
 
-@pytest.mark.asyncio
 async def test_derived_cannot_be_set_async():
     base = quark(5)
     derived = quark(lambda get: get(base) * 2, deps=[base])
@@ -35,7 +37,6 @@ async def test_derived_cannot_be_set_async():
         await derived.set_async(10)
 
 
-@pytest.mark.asyncio
 async def test_async_propagates_to_derived():
     base = quark(10)
     values = []
@@ -49,19 +50,13 @@ async def test_async_propagates_to_derived():
     assert values == [30, 40]
 
 
-@pytest.mark.asyncio
 async def test_concurrent_updates():
     counter = quark(0)
 
-    async def increment():
-        await asyncio.sleep(0.01)
-        await counter.set_async(counter.value + 1)
-
-    await asyncio.gather(*[increment() for _ in range(5)])
-    assert counter.value >= 1
+    await asyncio.gather(*[counter.update_async(lambda v: v + 1) for _ in range(5)])
+    assert counter.value == 5
 
 
-@pytest.mark.asyncio
 async def test_async_error_in_callback():
     sensor = quark(0)
     values = []
@@ -73,3 +68,52 @@ async def test_async_error_in_callback():
     await sensor.set_async(2)
 
     assert values == [1, 2]
+
+
+async def test_async_fanout_runs_in_parallel():
+    sensor = quark(0)
+    released = threading.Event()
+    calls = []
+
+    def slow(q):
+        # Only returns once a later subscriber has run alongside it
+        calls.append(("slow", released.wait(5.0)))
+
+    sensor.subscribe(slow)
+    sensor.subscribe(lambda q: released.set())
+
+    await sensor.set_async(1)
+    assert calls == [("slow", True)]
+
+
+async def test_async_fanout_order_and_error_isolation():
+    get_executor_manager().reset()
+    set_config(StateQuarkConfig(max_workers=1))
+    try:
+        sensor = quark(0)
+        calls = []
+        for i in range(6):
+            if i == 2:
+                sensor.subscribe(lambda q: 1 / 0)
+            sensor.subscribe(lambda q, i=i: calls.append(i))
+
+        await sensor.set_async(1)
+        assert calls == list(range(6))
+    finally:
+        reset_config()
+        get_executor_manager().reset()
+
+
+async def test_set_async_inside_batch_notifies_once():
+    a = quark(1)
+    b = quark(2)
+    total = quark(lambda get: get(a) + get(b), deps=[a, b])
+    calls = []
+    total.subscribe(lambda q: calls.append(q.value))
+
+    with batch():
+        await a.set_async(10)
+        await b.set_async(20)
+        assert calls == []
+
+    assert calls == [30]
@@ -1,7 +1,5 @@
 """Basic quark functionality tests."""
 
-import pytest
-
 from statequark import Quark, __version__, quark
 
 
@@ -19,6 +17,12 @@ def test_set():
     assert counter.value == 42
 
 
+def test_update():
+    counter = quark(1)
+    counter.update(lambda v: v + 1)
+    assert counter.value == 2
+
+
 def test_different_data_types():
     assert quark([1, 2, 3]).value == [1, 2, 3]
     assert quark({"key": "value"}).value == {"key": "value"}
@@ -30,30 +34,6 @@ def test_repr():
     assert repr(quark("hello")) == "Quark(value='hello')"
 
 
-def test_derived_quark():
-    base = quark(2)
-    double = quark(lambda get: get(base) * 2, deps=[base])
-    assert double.value == 4
-    base.set(3)
-    assert double.value == 6
-
-
-@pytest.mark.asyncio
-async def test_async_set():
-    temp = quark(20.0)
-    await temp.set_async(25.5)
-    assert temp.value == 25.5
-
-
-def test_subscriptions():
-    values = []
-    counter = quark(0)
-    counter.subscribe(lambda q: values.append(q.value))
-    counter.set(1)
-    counter.set(2)
-    assert values == [1, 2]
-
-
 def test_import_compatibility():
     q = quark(42)
     assert isinstance(q, Quark)
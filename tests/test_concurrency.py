@@ -1,7 +1,6 @@
 """Thread safety and concurrency tests."""
 
 import threading
-import time
 from concurrent.futures import ThreadPoolExecutor
 
 from statequark import quark
@@ -12,7 +11,7 @@ def test_thread_safety_basic():
 
     def worker():
         for _ in range(100):
-            counter.set(counter.value + 1)
+            counter.update(lambda v: v + 1)
 
     threads = [threading.Thread(target=worker) for _ in range(5)]
     for t in threads:
@@ -68,11 +67,90 @@ def test_derived_thread_safety():
     assert len(results) == 150
 
 
+def test_stress_test_subscriptions():
+    sensor = quark(0)
+    # Callbacks run on the writer thread, so each writer counts into its own list
+    local = threading.local()
+    per_thread = []
+
+    def make_callback(i):
+        def callback(q):
+            local.counts[i] += 1
+
+        return callback
+
+    for i in range(50):
+        sensor.subscribe(make_callback(i))
+
+    def worker():
+        local.counts = [0] * 50
+        per_thread.append(local.counts)
+        for i in range(20):
+            sensor.set(i)
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert [sum(c) for c in zip(*per_thread, strict=True)] == [100] * 50
+
+
+def test_reader_writer_scenario():
+    count_q = quark(0)
+    data_q = quark(())
+    read_results = []
+
+    def writer(start):
+        for i in range(start, start + 10):
+            count_q.update(lambda c: c + 1)
+            data_q.update(lambda t, i=i: (*t, f"item_{i}"))
+
+    def reader():
+        for _ in range(20):
+            read_results.append(count_q.value)
+
+    threads = [threading.Thread(target=writer, args=(i * 10,)) for i in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert count_q.value == 40
+    assert sorted(data_q.value) == sorted(f"item_{i}" for i in range(40))
+    assert all(0 <= c <= 40 for c in read_results)
+
+
+def test_concurrent_subscribe_unsubscribe():
+    sensor = quark(0)
+    seen = []
+    sensor.subscribe(seen.append)
+    barrier = threading.Barrier(3)
+
+    def worker():
+        barrier.wait(timeout=5.0)
+        for i in range(10):
+            unsub = sensor.subscribe(lambda q: None)
+            sensor.set(i)
+            unsub()
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sensor._callbacks == (seen.append,)
+    assert len(seen) == 30
+
+
 def test_thread_pool_executor():
     counter = quark(0)
 
     def task():
-        counter.set(counter.value + 1)
+        counter.update(lambda v: v + 1)
 
     with ThreadPoolExecutor(max_workers=5) as executor:
         futures = [executor.submit(task) for _ in range(100)]
@@ -88,15 +166,18 @@ def test_deadlock_prevention():
     q1.subscribe(lambda q: q2.value)
     q2.subscribe(lambda q: q1.value)
 
+    # Meet every iteration so the two writers interleave as tightly as possible
+    barrier = threading.Barrier(2)
+
     def worker1():
         for i in range(10):
+            barrier.wait(timeout=5.0)
             q1.set(i)
-            time.sleep(0.001)
 
     def worker2():
         for i in range(10):
+            barrier.wait(timeout=5.0)
             q2.set(i)
-            time.sleep(0.001)
 
     t1 = threading.Thread(target=worker1)
     t2 = threading.Thread(target=worker2)
@@ -108,3 +189,26 @@ def test_deadlock_prevention():
 
     assert not t1.is_alive()
     assert not t2.is_alive()
+
+
+def test_callbacks_can_reenter_their_quark():
+    sensor = quark(0)
+    doubled = quark(lambda get: get(sensor) * 2, deps=[sensor])
+    seen = []
+
+    def reenter(q):
+        seen.append(q.value)
+        unsubscribe = q.subscribe(lambda _: None)
+        unsubscribe()
+        if q.value < 3:
+            q.set(q.value + 1)
+
+    sensor.subscribe(reenter)
+
+    worker = threading.Thread(target=sensor.set, args=(1,))
+    worker.start()
+    worker.join(timeout=5.0)
+
+    assert not worker.is_alive()
+    assert seen == [1, 2, 3]
+    assert doubled.value == 6
@@ -1,5 +1,6 @@
 """Configuration tests."""
 
+import dataclasses
 import threading
 
 import pytest
@@ -51,6 +52,22 @@ def test_config_validation():
     with pytest.raises(ValueError):
         StateQuarkConfig(max_workers=64)
 
+    with pytest.raises(ValueError):
+        StateQuarkConfig(max_workers=2, min_workers=3)
+
+
+def test_config_is_frozen():
+    reset_config()
+    config = get_config()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.max_workers = 8  # type: ignore[misc]
+
+    enable_debug()
+    assert get_config().debug is True
+    assert config.debug is False
+    reset_config()
+
 
 def test_context_manager():
     values = []
@@ -68,12 +85,24 @@ def test_config_thread_safety():
     results = []
 
     def worker():
-        results.append(get_config().max_workers)
+        results.append(get_config())
 
-    threads = [threading.Thread(target=worker) for _ in range(10)]
+    threads = [threading.Thread(target=worker) for _ in range(100)]
     for t in threads:
         t.start()
     for t in threads:
         t.join()
 
-    assert all(w == 4 for w in results)
+    assert all(c is results[0] for c in results)
+    assert results[0].max_workers == 4
+
+
+def test_building_config_does_not_touch_logger():
+    enable_debug()
+    try:
+        StateQuarkConfig(max_workers=2)
+        assert get_config().debug is True
+        assert is_debug_enabled() is True
+    finally:
+        reset_config()
+    assert is_debug_enabled() is False
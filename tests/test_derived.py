@@ -1,8 +1,10 @@
 """Derived quark tests."""
 
+import operator
+
 import pytest
 
-from statequark import quark
+from statequark import batch, quark
 
 
 def test_simple_derived():
@@ -67,3 +69,173 @@ def test_conditional_logic():
     assert alarm.value == "WARNING"
     value.set(80.0)
     assert alarm.value == "ALARM"
+
+
+def test_derived_equals_skips_unchanged():
+    temp = quark(20.0)
+    heating = quark(lambda get: get(temp) < 18.0, deps=[temp], equals=operator.eq)
+
+    changes = []
+    heating.subscribe(lambda q: changes.append(q.value))
+
+    temp.set(19.0)
+    temp.set(21.0)
+    assert changes == []
+
+    temp.set(17.0)
+    temp.set(16.0)
+    temp.set(22.0)
+    assert changes == [True, False]
+
+
+def test_derived_equals_multiple_dependencies():
+    temp = quark(25.0)
+    humidity = quark(60.0)
+    comfort = quark(
+        lambda get: (
+            "ok" if 20 <= get(temp) <= 26 and 40 <= get(humidity) <= 70 else "bad"
+        ),
+        deps=[temp, humidity],
+        equals=operator.eq,
+    )
+
+    calls = []
+    comfort.subscribe(lambda q: calls.append(q.value))
+
+    for _ in range(100):
+        temp.set(25.0)
+        humidity.set(55.0)
+    assert calls == []
+
+    humidity.set(90.0)
+    assert calls == ["bad"]
+
+
+def test_derived_equals_custom():
+    reading = quark(20.0)
+    smoothed = quark(
+        lambda get: get(reading),
+        deps=[reading],
+        equals=lambda a, b: abs(a - b) < 0.5,
+    )
+
+    changes = []
+    smoothed.subscribe(lambda q: changes.append(q.value))
+
+    reading.set(20.2)
+    reading.set(21.0)
+    assert changes == [21.0]
+
+
+def test_derived_caches_between_changes():
+    calls = []
+    base = quark(2)
+
+    def double(get):
+        calls.append(1)
+        return get(base) * 2
+
+    doubled = quark(double, deps=[base])
+    assert len(calls) == 1
+
+    for _ in range(5):
+        assert doubled.value == 4
+    assert len(calls) == 1
+
+    base.set(3)
+    assert doubled.value == 6
+    assert doubled.value == 6
+    assert len(calls) == 2
+
+
+def test_nested_derived_recomputes_on_read():
+    calls = []
+    base = quark(2)
+
+    def double(get):
+        calls.append(1)
+        return get(base) * 2
+
+    doubled = quark(double, deps=[base])
+    quadrupled = quark(lambda get: get(doubled) * 2, deps=[doubled])
+    calls.clear()
+
+    base.set(3)
+    base.set(4)
+    base.set(5)
+    assert calls == []
+
+    assert quadrupled.value == 20
+    assert len(calls) == 1
+
+
+def test_diamond_derived_computes_once_per_write():
+    living_room = quark(21.0)
+    bedroom = quark(19.0)
+    kitchen = quark(23.0)
+    sensors = [living_room, bedroom, kitchen]
+    avg_temp = quark(lambda get: sum(get(s) for s in sensors) / 3, deps=sensors)
+
+    count = [0]
+
+    def variance(get):
+        count[0] += 1
+        avg = get(avg_temp)
+        return sum((get(s) - avg) ** 2 for s in sensors) / 3
+
+    spread = quark(variance, deps=[*sensors, avg_temp])
+
+    bedroom.set(18.0)
+    assert spread.value == pytest.approx(38 / 9)
+    assert count[0] == 2
+
+
+def test_derived_fresh_inside_batch():
+    base = quark(1)
+    doubled = quark(lambda get: get(base) * 2, deps=[base])
+
+    with batch():
+        base.set(5)
+        assert doubled.value == 10
+    assert doubled.value == 10
+
+
+def test_batched_flush_reads_hit_the_cache():
+    calls = {"d": 0, "e": 0}
+    a = quark(1)
+
+    def d_getter(get):
+        calls["d"] += 1
+        return get(a) + 1
+
+    def e_getter(get):
+        calls["e"] += 1
+        return get(d) * 2
+
+    d = quark(d_getter, deps=[a])
+    e = quark(e_getter, deps=[d])
+    seen = []
+    for _ in range(3):
+        e.subscribe(lambda q: seen.append(q.value))
+    calls.update(d=0, e=0)
+
+    with batch():
+        a.set(5)
+
+    assert seen == [12, 12, 12]
+    assert e.value == 12
+    assert calls == {"d": 1, "e": 1}
+
+
+def test_dep_subscriber_reads_fresh_downstream_in_batch():
+    a = quark(1)
+    seen = []
+    # Subscribed before d exists, so it runs before d hears of the change
+    a.subscribe(lambda q: seen.append(e.value))
+    d = quark(lambda get: get(a) + 1, deps=[a])
+    e = quark(lambda get: get(d) * 2, deps=[d])
+
+    with batch():
+        a.set(5)
+
+    assert seen == [12]
@@ -1,15 +1,17 @@
 """Executor tests."""
 
+import os
 import threading
 import time
 
 import pytest
 
-from statequark import quark
+from statequark import StateQuarkConfig, quark, reset_config, set_config
 from statequark.executor import (
     cleanup_executor,
     get_executor_manager,
     get_shared_executor,
+    prewarm_executor,
 )
 
 
@@ -90,3 +92,89 @@ def test_multiple_tasks():
 
     assert sorted(results) == list(range(10))
     assert sorted(task_results) == [i * 2 for i in range(10)]
+
+
+def test_prewarm_starts_workers():
+    get_executor_manager().reset()
+    prewarm_executor(2)
+    executor = get_shared_executor()
+    assert len(executor._threads) == 2
+
+
+def test_prewarm_does_not_wait_for_busy_pool():
+    get_executor_manager().reset()
+    set_config(StateQuarkConfig(max_workers=2))
+    try:
+        release = threading.Event()
+        executor = get_shared_executor()
+        busy = [executor.submit(release.wait, 10.0) for _ in range(2)]
+
+        start = time.monotonic()
+        prewarm_executor(2)
+        assert time.monotonic() - start < 5.0
+        release.set()
+        assert [f.result() for f in busy] == [True, True]
+    finally:
+        reset_config()
+
+
+def test_min_workers_started_with_pool():
+    get_executor_manager().reset()
+    set_config(StateQuarkConfig(min_workers=3))
+    try:
+        assert len(get_shared_executor()._threads) == 3
+    finally:
+        reset_config()
+
+
+def test_cleanup_drains_queued_callbacks_by_default():
+    get_executor_manager().reset()
+    set_config(StateQuarkConfig(max_workers=1))
+    try:
+        release = threading.Event()
+        executor = get_shared_executor()
+        executor.submit(release.wait, 5.0)
+        queued = executor.submit(lambda: 42)
+
+        closer = threading.Thread(target=cleanup_executor)
+        closer.start()
+        release.set()
+        closer.join()
+
+        assert queued.result() == 42
+    finally:
+        reset_config()
+
+
+def test_cleanup_cancels_queued_callbacks():
+    get_executor_manager().reset()
+    set_config(StateQuarkConfig(max_workers=1, shutdown_cancel_pending=True))
+    try:
+        release = threading.Event()
+        executor = get_shared_executor()
+        running = executor.submit(release.wait, 5.0)
+        queued = executor.submit(lambda: 42)
+
+        closer = threading.Thread(target=cleanup_executor)
+        closer.start()
+        deadline = time.monotonic() + 5.0
+        while not queued.cancelled() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        closer.join()
+
+        assert queued.cancelled()
+        assert running.result() is True
+    finally:
+        reset_config()
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+def test_pin_workers():
+    get_executor_manager().reset()
+    set_config(StateQuarkConfig(pin_workers=True))
+    try:
+        future = get_shared_executor().submit(os.sched_getaffinity, 0)
+        assert len(future.result(timeout=5.0)) == 1
+    finally:
+        reset_config()
@@ -1,8 +1,18 @@
 """Tests for quark family utilities."""
 
+import pytest
+
 from statequark import quark, quark_family
 
 
+@pytest.fixture
+def populated_family():
+    sensors = quark_family(lambda id: quark(0.0))
+    sensors("a")
+    sensors("b")
+    return sensors
+
+
 class TestQuarkFamily:
     def test_create_and_cache(self):
         sensors = quark_family(lambda id: quark(0.0))
@@ -15,28 +25,19 @@ class TestQuarkFamily:
         assert s1 is not s2
         assert sensors.size == 2
 
-    def test_remove(self):
-        sensors = quark_family(lambda id: quark(0.0))
-        sensors("a")
-        sensors("b")
-
+    def test_remove(self, populated_family):
+        sensors = populated_family
         assert sensors.size == 2
         sensors.remove("a")
         assert sensors.size == 1
         assert not sensors.has("a")
         assert sensors.has("b")
 
-    def test_clear(self):
-        sensors = quark_family(lambda id: quark(0.0))
-        sensors("a")
-        sensors("b")
+    def test_clear(self, populated_family):
+        sensors = populated_family
         sensors.clear()
 
         assert sensors.size == 0
 
-    def test_keys(self):
-        sensors = quark_family(lambda id: quark(0.0))
-        sensors("x")
-        sensors("y")
-
-        assert set(sensors.keys()) == {"x", "y"}
+    def test_keys(self, populated_family):
+        assert set(populated_family.keys()) == {"a", "b"}
@@ -1,8 +1,18 @@
 """Tests for middleware utilities."""
 
+import pytest
+
 from statequark import middleware, persist
 
 
+def double(old, new, next):
+    next(new * 2)
+
+
+def increment(old, new, next):
+    next(new + 1)
+
+
 class TestMiddleware:
     def test_basic_middleware(self):
         log = []
@@ -13,13 +23,17 @@ class TestMiddleware:
         q.set(2)
         assert log == [(0, 1), (1, 2)]
 
-    def test_middleware_chain(self):
+    @pytest.mark.parametrize(
+        ("chain", "expected"),
+        [([double, increment], 11), ([increment, double], 12), ([double, double], 20)],
+    )
+    def test_middleware_chain(self, chain, expected):
         q = middleware(0)
-        q.use(lambda o, n, next: next(n * 2))
-        q.use(lambda o, n, next: next(n + 1))
+        for mw in chain:
+            q.use(mw)
 
         q.set(5)
-        assert q.value == 11
+        assert q.value == expected
 
     def test_persist_middleware(self):
         storage = {}
@@ -28,3 +42,42 @@ class TestMiddleware:
 
         q.set(42)
         assert storage["count"] == 42
+
+    def test_persist_skips_unchanged_writes(self):
+        writes = []
+
+        class Storage(dict):
+            def __setitem__(self, key, value):
+                writes.append(value)
+                super().__setitem__(key, value)
+
+            def get(self, key, default=None):
+                raise AssertionError("persist should not read the backend")
+
+            __getitem__ = get
+
+        storage = Storage()
+        q = middleware(0)
+        q.use(persist(storage, "count"))
+
+        q.set(1)
+        q.set(1)
+        q.set(2)
+        assert writes == [1, 2]
+
+    def test_persist_writes_value_mutated_in_place(self):
+        writes = []
+
+        class Storage(dict):
+            def __setitem__(self, key, value):
+                writes.append(dict(value))
+                super().__setitem__(key, value)
+
+        reading = {"temp": 21.0}
+        q = middleware({})
+        q.use(persist(Storage(), "reading"))
+
+        q.set(reading)
+        reading["temp"] = 22.0
+        q.set(reading)
+        assert writes == [{"temp": 21.0}, {"temp": 22.0}]
@@ -1,5 +1,8 @@
 """Tests for new features: reset() and batch()."""
 
+import operator
+import threading
+
 import pytest
 
 from statequark import Quark, batch, quark
@@ -72,6 +75,77 @@ def test_batch_with_derived():
     assert notifications[0] == 30
 
 
+def test_batch_three_deps_notifies_once():
+    temp = quark(20.0)
+    humidity = quark(50.0)
+    pressure = quark(1013.0)
+    weather = quark(
+        lambda get: (get(temp), get(humidity), get(pressure)),
+        deps=[temp, humidity, pressure],
+    )
+
+    notifications = []
+    weather.subscribe(lambda q: notifications.append(q.value))
+
+    with batch():
+        temp.set(25.0)
+        humidity.set(60.0)
+        pressure.set(1000.0)
+
+    assert notifications == [(25.0, 60.0, 1000.0)]
+
+
+def test_batch_diamond_computes_once():
+    a = quark(1)
+    b = quark(2)
+    computes = []
+
+    def total(get):
+        computes.append(1)
+        return get(a) + get(b)
+
+    c = quark(total, deps=[a, b])
+    d = quark(lambda get: (get(a), get(c)), deps=[a, c])
+    seen = []
+    d.subscribe(lambda q: seen.append(q.value))
+    computes.clear()
+
+    with batch():
+        a.set(10)
+        b.set(20)
+
+    assert len(computes) == 1
+    assert seen == [(10, 30)]
+
+
+def test_nested_batch_flushes_at_outer_exit():
+    values = []
+    a = quark(0)
+    a.subscribe(lambda q: values.append(q.value))
+
+    with batch():
+        with batch():
+            a.set(1)
+        assert values == []
+        a.set(2)
+
+    assert values == [2]
+
+
+def test_batch_is_per_thread():
+    values = []
+    a = quark(0)
+    a.subscribe(lambda q: values.append(q.value))
+
+    with batch():
+        worker = threading.Thread(target=a.set, args=(1,))
+        worker.start()
+        worker.join()
+        assert values == [1]
+
+    assert values == [1]
+
+
 def test_batch_empty():
     with batch():
         pass  # No error
@@ -95,3 +169,30 @@ def test_batch_exception_still_notifies():
 
     assert a.value == 5
     assert notified == [5]  # Still notified after exception
+
+
+def test_batch_getter_error_does_not_drop_siblings():
+    errors = []
+    a = quark(1, error_handler=lambda e, cb, q: errors.append(str(e)))
+
+    def fragile(get):
+        if get(a) > 1:
+            raise ValueError("sensor offline")
+        return get(a)
+
+    broken = quark(fragile, deps=[a], equals=operator.eq)
+    doubled = quark(lambda get: get(a) * 2, deps=[a])
+    seen = []
+    doubled.subscribe(lambda q: seen.append(q.value))
+    broken.set_error_handler(lambda e, cb, q: errors.append(f"flush: {e}"))
+
+    with batch():
+        a.set(2)
+
+    assert seen == [4]
+    assert errors == ["flush: sensor offline"]
+
+    # The batch is fully drained, so later batches still flush
+    with batch():
+        a.set(1)
+    assert seen == [4, 2]
@@ -3,15 +3,27 @@
 from statequark import quark_with_reducer
 
 
+def counter_reducer(state, action):
+    if action == "INC":
+        return state + 1
+    if action == "DEC":
+        return state - 1
+    return state
+
+
+def motor_reducer(state, action):
+    match action["type"]:
+        case "START":
+            return {**state, "running": True}
+        case "STOP":
+            return {**state, "running": False}
+        case "SET_SPEED":
+            return {**state, "speed": action["value"]}
+    return state
+
+
 class TestQuarkWithReducer:
     def test_basic_reducer(self):
-        def counter_reducer(state, action):
-            if action == "INC":
-                return state + 1
-            if action == "DEC":
-                return state - 1
-            return state
-
         counter = quark_with_reducer(0, counter_reducer)
         assert counter.value == 0
 
@@ -26,16 +38,6 @@ class TestQuarkWithReducer:
         assert counter.value == 2
 
     def test_reducer_with_dict_action(self):
-        def motor_reducer(state, action):
-            match action["type"]:
-                case "START":
-                    return {**state, "running": True}
-                case "STOP":
-                    return {**state, "running": False}
-                case "SET_SPEED":
-                    return {**state, "speed": action["value"]}
-            return state
-
         motor = quark_with_reducer({"running": False, "speed": 0}, motor_reducer)
         motor.dispatch({"type": "START"})
         assert motor.value["running"] is True
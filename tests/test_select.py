@@ -5,16 +5,20 @@ import pytest
 from statequark import quark, select
 
 
+def get_temp(reading):
+    return reading["temp"]
+
+
 class TestSelect:
     def test_select_field(self):
         sensor = quark({"temp": 25.0, "humidity": 60})
-        temp = select(sensor, lambda d: d["temp"])
+        temp = select(sensor, get_temp)
 
         assert temp.value == 25.0
 
     def test_select_only_triggers_on_change(self):
         sensor = quark({"temp": 25.0, "humidity": 60})
-        temp = select(sensor, lambda d: d["temp"])
+        temp = select(sensor, get_temp)
 
         changes = []
         temp.subscribe(lambda x: changes.append(x.value))
@@ -1,33 +1,222 @@
 """Tests for storage utilities."""
 
-import tempfile
+import asyncio
+import gc
+import os
+import time
+import uuid
+import weakref
 
-from statequark import quark_with_storage
+import pytest
+
+from statequark import batch, quark_with_storage
 from statequark.utils.storage import FileStorage, MemoryStorage
 
 
+@pytest.fixture(scope="class")
+def storage_dir(tmp_path_factory):
+    # Shared across a class; tests that list the directory use tmp_path
+    return tmp_path_factory.mktemp("fs")
+
+
+@pytest.fixture(scope="class")
+def shared_memory_storage():
+    return MemoryStorage()
+
+
+@pytest.fixture
+def memory_storage(shared_memory_storage):
+    # One instance per class, emptied before each test
+    shared_memory_storage.clear()
+    return shared_memory_storage
+
+
 class TestQuarkWithStorage:
-    def test_memory_storage(self):
-        storage = MemoryStorage()
-        q = quark_with_storage("test", 10, storage)
+    def test_memory_storage(self, memory_storage):
+        q = quark_with_storage("test", 10, memory_storage)
         assert q.value == 10
 
         q.set(20)
         assert q.value == 20
-        assert storage.get("test", 0) == 20
+        assert memory_storage.get("test", 0) == 20
 
-    def test_file_storage(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            storage = FileStorage(tmpdir)
-            q = quark_with_storage("sensor", 25.0, storage)
-            q.set(30.0)
+    def test_memory_storage_clear(self, memory_storage):
+        memory_storage.set("test", 20)
+        memory_storage.clear()
 
-            q2 = quark_with_storage("sensor", 0.0, storage)
-            assert q2.value == 30.0
+        assert memory_storage.get("test", 0) == 0
 
-    def test_storage_with_dict(self):
-        storage = MemoryStorage()
-        q = quark_with_storage("config", {"threshold": 25}, storage)
+    def test_file_storage(self, storage_dir):
+        key = f"sensor-{uuid.uuid4()}"
+        storage = FileStorage(storage_dir)
+        q = quark_with_storage(key, 25.0, storage)
+        q.set(30.0)
+
+        q2 = quark_with_storage(key, 0.0, storage)
+        assert q2.value == 30.0
+
+    def test_storage_with_dict(self, memory_storage):
+        q = quark_with_storage("config", {"threshold": 25}, memory_storage)
         q.set({"threshold": 30, "enabled": True})
 
-        assert storage.get("config", {})["threshold"] == 30
+        assert memory_storage.get("config", {})["threshold"] == 30
+
+    @pytest.mark.asyncio
+    async def test_set_async_persists(self):
+        storage = MemoryStorage()
+        q = quark_with_storage("async", 1, storage)
+        await q.set_async(2)
+
+        assert q.value == 2
+        assert storage.get("async", 0) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_set_async_persists_latest(self):
+        class SlowStorage(MemoryStorage):
+            def set(self, key, value):
+                if value == 1:
+                    time.sleep(0.05)
+                super().set(key, value)
+
+        storage = SlowStorage()
+        q = quark_with_storage("level", 0, storage)
+        await asyncio.gather(q.set_async(1), q.set_async(2))
+
+        assert q.value == 2
+        assert storage.get("level", 0) == 2
+
+    def test_unchanged_set_skips_storage(self):
+        writes = []
+
+        class CountingStorage(MemoryStorage):
+            def set(self, key, value):
+                writes.append(dict(value))
+                super().set(key, value)
+
+        reading = {"temp": 21.0}
+        q = quark_with_storage("reading", {}, CountingStorage())
+        q.set(reading)
+        q.set({"temp": 21.0})
+        assert writes == [{"temp": 21.0}]
+
+        reading["temp"] = 22.0
+        q.set(reading)
+        assert writes == [{"temp": 21.0}, {"temp": 22.0}]
+
+    def test_batch_coalesces_writes(self):
+        writes = []
+
+        class CountingStorage(MemoryStorage):
+            def set(self, key, value):
+                writes.append((key, value))
+                super().set(key, value)
+
+        storage = CountingStorage()
+        moisture = quark_with_storage("moisture", 30.0, storage)
+        waterings = quark_with_storage("waterings", 0, storage)
+
+        with batch():
+            moisture.set(50.0)
+            moisture.set(80.0)
+            waterings.set(1)
+
+        assert sorted(writes) == [("moisture", 80.0), ("waterings", 1)]
+
+    @pytest.mark.asyncio
+    async def test_set_async_in_batch_writes_once(self):
+        writes = []
+
+        class CountingStorage(MemoryStorage):
+            def set(self, key, value):
+                writes.append((key, value))
+                super().set(key, value)
+
+        q = quark_with_storage("level", 0, CountingStorage())
+        with batch():
+            await q.set_async(1)
+            await q.set_async(2)
+
+        assert writes == [("level", 2)]
+
+    def test_file_storage_roundtrip(self, tmp_path):
+        storage = FileStorage(tmp_path)
+        value = {"threshold": 25.5, "zones": [1, 2, 3], "enabled": True}
+        storage.set("config", value)
+
+        assert storage.get("config", {}) == value
+        assert storage.get("missing", "default") == "default"
+        assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+    def test_file_storage_failed_write_leaves_no_tmp(self, tmp_path, monkeypatch):
+        storage = FileStorage(tmp_path)
+        storage.set("temp", 21.5)
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail)
+        storage.set("temp", 22.0)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["temp.json"]
+        assert storage.get("temp", 0.0) == 21.5
+
+    def test_file_storage_sanitizes_keys(self, tmp_path):
+        storage = FileStorage(tmp_path)
+        storage.set("../sensors/temp\\1", 21.5)
+
+        assert storage.get("../sensors/temp\\1", 0.0) == 21.5
+        assert [p.name for p in tmp_path.iterdir()] == ["__sensors_temp_1.json"]
+
+    def test_file_storage_skips_unchanged_write(self, tmp_path):
+        storage = FileStorage(tmp_path)
+        storage.set("temp", 21.5)
+        path = tmp_path / "temp.json"
+        inode = path.stat().st_ino
+
+        storage.set("temp", 21.5)
+        assert path.stat().st_ino == inode
+        storage.set("temp", 22.0)
+        assert path.stat().st_ino != inode
+        assert storage.get("temp", 0.0) == 22.0
+
+    def test_file_storage_rewrites_after_external_change(self, tmp_path):
+        s1 = FileStorage(tmp_path)
+        s2 = FileStorage(tmp_path)
+        s1.set("temp", 1)
+        s2.set("temp", 2)
+        s1.set("temp", 1)
+        assert s2.get("temp", 0) == 1
+
+        (tmp_path / "temp.json").unlink()
+        s1.set("temp", 1)
+        assert s2.get("temp", 0) == 1
+
+    def test_file_storage_write_behind(self, tmp_path):
+        storage = FileStorage(tmp_path, flush_interval=60.0)
+        storage.set("temp", 21.0)
+        storage.set("temp", 22.5)
+
+        assert not (tmp_path / "temp.json").exists()
+        assert storage.get("temp", 0.0) == 22.5
+
+        storage.flush()
+        assert FileStorage(tmp_path).get("temp", 0.0) == 22.5
+
+    def test_file_storage_write_behind_is_not_kept_alive(self, tmp_path):
+        storage = FileStorage(tmp_path, flush_interval=60.0)
+        storage.set("temp", 21.0)
+        storage.flush()
+        ref = weakref.ref(storage)
+
+        del storage
+        gc.collect()
+        assert ref() is None
+
+    def test_file_storage_flush_skips_unwritable_value(self, tmp_path):
+        storage = FileStorage(tmp_path, flush_interval=60.0)
+        storage.set("bad", object())
+        storage.set("temp", 21.0)
+
+        storage.flush()
+        assert FileStorage(tmp_path).get("temp", 0.0) == 21.0
+        assert storage.get("bad", None) is None
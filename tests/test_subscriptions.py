@@ -1,5 +1,8 @@
 """Subscription tests."""
 
+import gc
+import operator
+
 from statequark import quark
 
 
@@ -102,3 +105,93 @@ def test_no_duplicate_subscription():
     counter.set(1)
 
     assert values == [1]
+
+
+def test_equals_skips_repeated_value():
+    values = []
+    sensor = quark(20.0, equals=operator.eq)
+    sensor.subscribe(lambda q: values.append(q.value))
+
+    sensor.set(20.0)
+    sensor.set(21.0)
+    sensor.set(21.0)
+
+    assert values == [21.0]
+
+
+def test_repeated_value_notifies_by_default():
+    values = []
+    sensor = quark(20.0)
+    sensor.subscribe(lambda q: values.append(q.value))
+
+    sensor.set(20.0)
+    sensor.set(20.0)
+
+    assert values == [20.0, 20.0]
+
+
+def test_no_callback_on_unchanged_derived():
+    base = quark(10)
+    tens = quark(lambda get: get(base) // 10, deps=[base], equals=operator.eq)
+    doubled = quark(lambda get: get(tens) * 2, deps=[tens])
+
+    calls = []
+    doubled.subscribe(lambda q: calls.append(q.value))
+
+    base.set(15)
+    base.set(19)
+    assert calls == []
+
+    base.set(20)
+    assert calls == [4]
+
+
+def test_weak_subscription_released_with_owner():
+    values = []
+
+    class Display:
+        def show(self, q):
+            values.append(q.value)
+
+    sensor = quark(0)
+    display = Display()
+    sensor.subscribe(display.show, weak=True)
+
+    sensor.set(1)
+    del display
+    gc.collect()
+    sensor.set(2)
+
+    assert values == [1]
+    assert sensor._callbacks == ()
+
+
+def test_weak_subscription_dedupes_same_method():
+    values = []
+
+    class Display:
+        def show(self, q):
+            values.append(q.value)
+
+    sensor = quark(0)
+    display = Display()
+    unsubscribe = sensor.subscribe(display.show, weak=True)
+    sensor.subscribe(display.show, weak=True)
+
+    sensor.set(1)
+    assert values == [1]
+
+    unsubscribe()
+    sensor.set(2)
+    assert values == [1]
+
+
+def test_wide_fanout_notifies_in_order():
+    calls = []
+    sensor = quark(0)
+    for i in range(6):
+        sensor.subscribe(lambda q, i=i: calls.append(i))
+
+    sensor.set(1)
+
+    assert calls == list(range(6))
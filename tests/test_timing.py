@@ -2,21 +2,36 @@
 
 import time
 
+import pytest
+
 from statequark import debounce, throttle
 
 
 class TestDebounce:
-    def test_debounce_delays_update(self):
+    def test_debounce_delays_update(self, fake_clock):
         q = debounce(0, 0.05)
         q.set(1)
         q.set(2)
         q.set(3)
 
+        fake_clock.advance(0.04)
         assert q.value == 0
 
-        time.sleep(0.1)
+        fake_clock.advance(0.01)
         assert q.value == 3
 
+    def test_debounce_restarts_on_each_set(self, fake_clock):
+        q = debounce(0, 0.05)
+        q.set(1)
+        fake_clock.advance(0.04)
+        q.set(2)
+        fake_clock.advance(0.04)
+
+        assert q.value == 0
+
+        fake_clock.advance(0.01)
+        assert q.value == 2
+
     def test_debounce_flush_now(self):
         q = debounce(0, 1.0)
         q.set(42)
@@ -24,7 +39,9 @@ class TestDebounce:
 
         assert q.value == 42
 
+    @pytest.mark.slow
     def test_debounce_subscription(self):
+        # Real timers, so the threading.Timer path stays covered end to end
         changes = []
         q = debounce(0, 0.05)
         q.subscribe(lambda x: changes.append(x.value))
@@ -38,7 +55,8 @@ class TestDebounce:
 
 
 class TestThrottle:
-    def test_throttle_limits_rate(self):
+    def test_throttle_limits_rate(self, fake_clock):
+        fake_clock.advance(1.0)
         q = throttle(0, 0.1)
         q.set(1)
         q.set(2)
@@ -46,7 +64,7 @@ class TestThrottle:
 
         assert q.value == 1
 
-        time.sleep(0.15)
+        fake_clock.advance(0.1)
         q.set(4)
         assert q.value == 4
 
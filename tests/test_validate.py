@@ -5,24 +5,32 @@ import pytest
 from statequark import ValidationError, clamp, in_range, validate
 
 
+def assert_rejects(fn, *args):
+    with pytest.raises(ValidationError):
+        fn(*args)
+
+
+@pytest.fixture
+def percent():
+    return validate(50, in_range(0, 100))
+
+
 class TestValidate:
-    def test_valid_value(self):
-        q = validate(50, in_range(0, 100))
-        q.set(75)
-        assert q.value == 75
+    @pytest.mark.parametrize("value", [0, 75, 100])
+    def test_valid_value(self, percent, value):
+        percent.set(value)
+        assert percent.value == value
 
-    def test_invalid_raises(self):
-        q = validate(50, in_range(0, 100))
-        with pytest.raises(ValidationError):
-            q.set(150)
+    @pytest.mark.parametrize("value", [150, -10])
+    def test_invalid_raises(self, percent, value):
+        assert_rejects(percent.set, value)
+        assert percent.value == 50
 
-    def test_clamp_on_invalid(self):
+    @pytest.mark.parametrize(("value", "expected"), [(150, 100), (-10, 0), (42, 42)])
+    def test_clamp_on_invalid(self, value, expected):
         q = validate(50, in_range(0, 100), clamp(0, 100))
-        q.set(150)
-        assert q.value == 100
-        q.set(-10)
-        assert q.value == 0
+        q.set(value)
+        assert q.value == expected
 
     def test_invalid_initial_raises(self):
-        with pytest.raises(ValidationError):
-            validate(150, in_range(0, 100))
+        assert_rejects(validate, 150, in_range(0, 100))